@@ -1,16 +1,75 @@
-import yaml
-from src.core.loader import load_data
-from src.core.engine import run
+from src.core.config import load_config
+from src.core.loader import load_data, load_market_df
+from src.core.engine import run_batch
 from src.strategy.strategy import Strategy
-import pandas as pd 
-import copy
+import pandas as pd
 import logging
-from src.core.metrics import sharpe_ratio, max_drawdown, cagr, cumulative_return
+import orjson
+from src.core.metrics import sharpe_ratio, compute_curve_metrics
 import numpy as np
 import matplotlib.pyplot as plt
 
 logger = logging.getLogger('ablation')
 
+
+def _summarize(opt: str, res: list) -> dict:
+    """
+    Compute and log the metric block for a single ablation variant.
+    Input:
+    opt (str): The ablation flag that was disabled for this run.
+    res (list): Trade dictionaries returned by the engine.
+    Output:
+    dict: The same per-variant object documented in run_ablation.
+    """
+    # one flat array of trade returns feeds every metric below
+    returns = np.fromiter(
+        (t["profit"] for t in res if t["profit"] is not None),
+        dtype=np.float64)
+    # drop NaN profits the same way the old Series.dropna() did
+    returns = returns[~np.isnan(returns)]
+
+    # equity curve, drawdowns and cagr come out of a single fused pass
+    curve = compute_curve_metrics(returns)
+    equity_curve = pd.Series(curve.equity_curve)
+
+    win_rate = np.count_nonzero(returns > 0) / returns.size if returns.size else np.nan
+
+    # clip-based sums avoid the mask+gather allocations of returns[returns>0]
+    pos_sum = returns.clip(min=0).sum()
+    neg_sum = -returns.clip(max=0).sum()
+    profit_factor = pos_sum / neg_sum if neg_sum else np.inf
+
+    metrics = {
+        "sharpe_ratio": sharpe_ratio(returns),
+        "max_drawdown": curve.max_drawdown,
+        "cagr": curve.cagr,
+        "equity_curve": equity_curve,
+        "win_rate": win_rate,
+        "profit_factor": profit_factor
+    }
+
+    logger.info("-" * 50)
+    logger.info("\tDISABLED feature: \t %s", opt)
+    logger.info("-" * 50)
+    logger.info("\t- sharpe ratio: %s", metrics['sharpe_ratio'])
+    logger.info("\t- max drawdown: %s", metrics['max_drawdown'])
+    logger.info("\t- cagr: %s", metrics['cagr'])
+    #logger.info("\t- equity curve: %s", metrics['equity_curve'])
+    logger.info("\t- win rate: %s", metrics['win_rate'])
+    logger.info("\t- profit factor: %s", metrics['profit_factor'])
+    logger.info("-" * 50)
+    # structured dump of the scalar metrics, serialized only at DEBUG
+    if logger.isEnabledFor(logging.DEBUG):
+        scalars = {k: v for k, v in metrics.items() if k != 'equity_curve'}
+        logger.debug("metrics=%s", orjson.dumps(scalars, default=str).decode())
+
+    return {
+        "disaled_feature": opt,
+        "all_trades": res,
+        "metrics": metrics
+    }
+
+
 def run_ablation() -> list:
     """
     Run ablation tests to isolate component contributions.
@@ -27,57 +86,26 @@ def run_ablation() -> list:
         }
     """
     
-    with open("./configs/base.yaml", "r") as f:
-        config = yaml.safe_load(f)
+    config = load_config("./configs/base.yaml")
 
-    df = pd.read_csv("./" + config['data']['clean_ES']) 
+    df = load_market_df("./" + config['data']['clean_ES'])
 
     config_opt = ['use_hurst', 'use_RSI_exit', 'use_take_profit']
-    output = []
-
-    for opt in config_opt:
-        tmp_config = copy.deepcopy(config)
-        if tmp_config['ablation'][opt]:
-            tmp_config['ablation'][opt] = False
-        else:
-            logging.error(f"The logic {opt} was not found!")
-        strategy = Strategy(cfg=tmp_config)
 
-        res = run(df=df, strategy=strategy)
+    # validate the config once; each variant clones this strategy with
+    # one flag flipped instead of re-running the whole __init__
+    base_strategy = Strategy(cfg=config)
 
-        returns = pd.Series((t["profit"] for t in res)).dropna()
+    # keep only the flags that exist (and are enabled) in the config, so
+    # no clone or backtest is built for an invalid flag
+    valid_opts = [o for o in config_opt if config.get('ablation', {}).get(o)]
+    for missing in set(config_opt) - set(valid_opts):
+        logger.error("The logic %s was not found!", missing)
+    strategies = [base_strategy.clone_with_ablation(opt, False)
+                  for opt in valid_opts]
 
-        equity_curve = cumulative_return(returns)
+    # the variants share the data and the indicator settings, so all
+    # backtests run in a single pass over the price series
+    all_res = run_batch(df, strategies)
 
-        win_rate = returns.sum() / len(returns)
-        
-        profit_factor = returns[returns > 0].sum() / abs(returns[returns < 0].sum())
-
-        metrics = {
-            "sharpe_ratio": sharpe_ratio(returns),
-            "max_drawdown": max_drawdown(equity_curve),
-            "cagr": cagr(equity_curve),
-            "equity_curve": equity_curve,
-            "win_rate": win_rate,
-            "profit_factor": profit_factor
-        }
-
-        logging.info("-" * 50)
-        logging.info("\tDISABLED feature: \t %s", opt)
-        logging.info("-" * 50)
-        logging.info(f"\t- sharpe ratio: {metrics['sharpe_ratio']}")
-        logging.info(f"\t- max drawdown: {metrics['max_drawdown']}")
-        logging.info(f"\t- cagr: {metrics['cagr']}")
-        #logging.info(f"\t- equity curve: {metrics['equity_curve']}")
-        logging.info(f"\t- win rate: {metrics['win_rate']}")
-        logging.info(f"\t- profit factor: {metrics['profit_factor']}")
-        logging.info("-" * 50)
-
-        out = {
-            "disaled_feature": opt,
-            "all_trades": res,
-            "metrics": metrics
-        }
-        output.append(out)
-        
-    return output
\ No newline at end of file
+    return [_summarize(opt, res) for opt, res in zip(valid_opts, all_res)]
\ No newline at end of file
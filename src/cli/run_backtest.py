@@ -1,5 +1,5 @@
-import yaml 
-import logging 
+import logging
+import orjson
 import sys
 from pathlib import Path
 import pandas as pd
@@ -8,11 +8,15 @@ import pandas as pd
 try:
     from ..strategy.strategy import Strategy
     from ..core.engine import run
+    from ..core.loader import load_market_df
+    from ..core.config import load_config
 except ImportError:
     # If running directly, add parent directory to path
     sys.path.insert(0, str(Path(__file__).parent.parent.parent))
     from src.strategy.strategy import Strategy
     from src.core.engine import run
+    from src.core.loader import load_market_df
+    from src.core.config import load_config
 
 def main() -> None:
     """
@@ -28,8 +32,7 @@ def main() -> None:
     project_root = Path(__file__).parent.parent.parent
     
     config_path = project_root / "configs" / "base.yaml"
-    with open(config_path, 'r') as file:
-        data = yaml.safe_load(file)
+    data = load_config(str(config_path))
     
     ###### logging setup ########
     logger_config = data.get('logger', {})
@@ -68,7 +71,7 @@ def main() -> None:
     #### dataframe loading ####
     data_path = project_root / "data" / "clean" / "NQ_clean.csv"
     try:
-        df = pd.read_csv(data_path)
+        df = load_market_df(str(data_path))
         # Log success
         logging.info('Successfully loaded the dataframe.')
 
@@ -82,9 +85,15 @@ def main() -> None:
     #### backtest running ####
     strategy = Strategy(data)
     logging.info(strategy.get_cfg())
-    all_trades = run(df[:200], strategy)
+    # optional debug cap on the number of bars; iloc keeps it a view
+    max_bars = data.get('debug', {}).get('max_bars', None)
+    df_view = df.iloc[:max_bars] if max_bars else df
+    all_trades = run(df_view, strategy)
     print(f"Completed {len(all_trades)} trades")
-    print(all_trades)
+    # full trade dump is O(N) serialization + IO; only pay for it at DEBUG,
+    # and serialize with orjson which is much faster than str(dict)
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("trades=%s", orjson.dumps(all_trades, default=str).decode())
 
 if __name__ == "__main__":
     main()
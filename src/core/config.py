@@ -0,0 +1,57 @@
+import os
+import yaml
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger('config')
+
+
+@lru_cache(maxsize=8)
+def _load_yaml(path: str, mtime: float) -> dict:
+    """
+    Parse a YAML file, memoized on (path, mtime).
+
+    Parameters
+    ----------
+    path : str
+        Path to the YAML file.
+    mtime : float
+        Modification time of the file; a changed file busts the cache entry.
+
+    Returns
+    -------
+    dict
+        The parsed configuration dictionary.
+    """
+    logger.info(f"Parsing config file: {path}")
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def load_config(path: str) -> dict:
+    """
+    Load a YAML configuration file with in-process caching.
+
+    Repeated invocations in the same interpreter (notebooks, sweeps, tests)
+    skip re-parsing as long as the file has not changed on disk.
+
+    Parameters
+    ----------
+    path : str
+        Path to the YAML configuration file.
+
+    Returns
+    -------
+    dict
+        The parsed configuration dictionary. Callers must copy the relevant
+        sub-dicts before mutating them, since the object is shared.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the configuration file does not exist.
+    """
+    if not os.path.exists(path):
+        logger.error(f"Config file not found: {path}")
+        raise FileNotFoundError(f"Config file not found: {path}")
+    return _load_yaml(str(path), os.path.getmtime(path))
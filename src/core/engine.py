@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from numba import njit, prange
 from ..strategy.strategy import Strategy
 from .indicators import *
 import yaml
@@ -6,6 +8,24 @@ import logging
 
 logger = logging.getLogger('engine')
 
+# canonical trade-record layout, in the order _collect_trades emits it
+TRADE_COLS = ['open_date', 'entry_price', 'bars',
+              'close_date', 'sell_price', 'profit']
+
+
+def trades_to_frame(all_trades: list) -> pd.DataFrame:
+    """
+    Convert the engine's list-of-dict trade log into a DataFrame.
+
+    Uses from_records with the fixed TRADE_COLS layout so pandas skips
+    per-row column/dtype inference on large trade lists.
+    Input:
+    all_trades (list): Trade dictionaries as returned by run()/run_batch().
+    Output:
+    pd.DataFrame: One row per closed trade, columns in TRADE_COLS order.
+    """
+    return pd.DataFrame.from_records(all_trades, columns=TRADE_COLS)
+
 
 def translator(signal: bool, info: str) -> str:
     """
@@ -24,132 +44,399 @@ def translator(signal: bool, info: str) -> str:
         return 'buy'
 
 
+def _profit_streaks(open_arr: np.ndarray, close_arr: np.ndarray) -> np.ndarray:
+    """
+    Length of the run of consecutive profitable closes ending at each bar.
+
+    Cumulative-reset idiom: track the index of the last losing bar with a
+    running maximum, then the streak at i is just i minus that index.
+    Lets the kernel test the take-profit exit with one comparison instead
+    of re-scanning the last K bars on every evaluation.
+    """
+    idx = np.arange(open_arr.size)
+    prof = close_arr >= open_arr
+    last_loss = np.maximum.accumulate(np.where(prof, -1, idx))
+    return idx - last_loss
+
+
+@njit(cache=True)
+def _engine_loop(open_arr, prof_streak, entry_ok, crsi_arr,
+                 use_time_exit, use_rsi_exit, use_take_profit,
+                 crsi_threshold, max_bars_in_trade, max_profitable_closes):
+    """
+    JIT-compiled bar-by-bar state machine over raw indicator arrays.
+
+    Entry decisions arrive as the precomputed boolean tape `entry_ok`
+    (built by Strategy.vectorized_entry); only the path-dependent exit
+    checks run inside the loop. A signal raised at bar i is executed at
+    the open of bar i+1. Returns the per-trade (open index, close index,
+    bars held) arrays plus the open index of a still-open trailing trade
+    (-1 if flat at the end); only closed trades are reported. The
+    open_position column is rebuilt from these indices by
+    :func:`_open_position_column` instead of being written per bar.
+    """
+    n = open_arr.size
+    max_trades = n // 2 + 1
+    open_idx = np.empty(max_trades, dtype=np.int64)
+    close_idx = np.empty(max_trades, dtype=np.int64)
+    bars_held = np.empty(max_trades, dtype=np.int64)
+    n_trades = 0
+
+    signal = 0  # 0 = flat, 1 = buy, 2 = sell
+    bars = 0
+    cur_open = -1
+    pos = False  # scalar position state; the column is rebuilt afterwards
+
+    for i in range(n):
+        if signal == 1:
+            # open the position
+            pos = True
+            cur_open = i
+            bars = 1
+            signal = 0
+
+        elif signal == 2:
+            # close the position and record the trade
+            pos = False
+            open_idx[n_trades] = cur_open
+            close_idx[n_trades] = i
+            bars_held[n_trades] = bars
+            n_trades += 1
+            cur_open = -1
+            bars = 0
+            signal = 0
+
+        else:
+            if bars != 0:
+                bars += 1
+
+            if pos:
+                # exit checks, in the same order as Strategy.exit_signal
+                exit_position = False
+                if use_time_exit and bars >= max_bars_in_trade:
+                    exit_position = True
+                if (not exit_position and use_take_profit
+                        and bars >= max_profitable_closes
+                        and prof_streak[i] >= max_profitable_closes):
+                    exit_position = True
+                if not exit_position and use_rsi_exit:
+                    curr_crsi = crsi_arr[i]
+                    if not np.isnan(curr_crsi) and curr_crsi > crsi_threshold:
+                        exit_position = True
+                if exit_position:
+                    signal = 2
+            else:
+                # entry decision was precomputed for every bar
+                if entry_ok[i]:
+                    signal = 1
+
+    return open_idx[:n_trades], close_idx[:n_trades], bars_held[:n_trades], cur_open
+
+
+@njit(parallel=True, cache=True)
+def _engine_loop_batch(open_arr, prof_streak, entry_stack, tape_idx, crsi_arr,
+                       use_time_exit, use_rsi_exit, use_take_profit,
+                       crsi_threshold, max_bars_in_trade, max_profitable_closes):
+    """
+    Parallel driver over a batch of strategy variants.
+
+    The state machines are independent given their entry tape and exit
+    parameters, so one prange iteration per variant distributes the
+    :func:`_engine_loop` passes across cores while every variant reads the
+    same shared price/indicator arrays. `entry_stack` holds the distinct
+    entry tapes and `tape_idx[p]` selects the one variant p uses. Trade
+    indices come back as fixed-width rows with `n_trades[p]` valid entries.
+    """
+    P = tape_idx.size
+    n = open_arr.size
+    max_trades = n // 2 + 1
+    open_idx = np.empty((P, max_trades), dtype=np.int64)
+    close_idx = np.empty((P, max_trades), dtype=np.int64)
+    bars_held = np.empty((P, max_trades), dtype=np.int64)
+    n_trades = np.empty(P, dtype=np.int64)
+    for p in prange(P):
+        o, c, b, _ = _engine_loop(
+            open_arr, prof_streak, entry_stack[tape_idx[p]], crsi_arr,
+            use_time_exit[p], use_rsi_exit[p], use_take_profit[p],
+            crsi_threshold[p], max_bars_in_trade[p], max_profitable_closes[p])
+        k = o.size
+        n_trades[p] = k
+        open_idx[p, :k] = o
+        close_idx[p, :k] = c
+        bars_held[p, :k] = b
+    return open_idx, close_idx, bars_held, n_trades
+
+
+def _open_position_column(n: int, open_idx: np.ndarray, close_idx: np.ndarray,
+                          cur_open: int) -> np.ndarray:
+    """
+    Rebuild the per-bar open_position column from the trade index arrays.
+
+    The position flips at most twice per trade, so instead of writing the
+    column on every bar inside the kernel, a +1/-1 delta tape is cumsummed
+    once: True from each open bar up to (excluding) its close bar, and
+    through the end of the series for a still-open trailing trade.
+    """
+    delta = np.zeros(n, dtype=np.int8)
+    delta[open_idx] = 1
+    delta[close_idx] = -1
+    if cur_open >= 0:
+        delta[cur_open] = 1
+    return np.cumsum(delta) > 0
+
+
+def _loop_params(cfg: dict) -> tuple:
+    """
+    Flatten the ablation flags and thresholds of a config into the scalar
+    tuple consumed by :func:`_engine_loop`.
+
+    Missing exit thresholds are logged and the corresponding exit check is
+    disabled, matching how Strategy.exit_signal treats them. Entry
+    parameters are handled by Strategy.vectorized_entry instead.
+    """
+    ablation = cfg.get('ablation', {})
+    exits_cfg = cfg.get('exit_thresholds', {})
+
+    use_time_exit = bool(ablation.get('use_time_exit', False))
+    # the composite-RSI exit is gated by use_composite_rsi in
+    # Strategy.exit_signal (use_RSI_exit only drives __init__ validation)
+    use_rsi_exit = bool(ablation.get('use_composite_rsi', False))
+    use_take_profit = bool(ablation.get('use_take_profit', False))
+
+    max_bars_in_trade = exits_cfg.get('max_bars_in_trade')
+    if use_time_exit and max_bars_in_trade is None:
+        logger.error("max_bars_in_trade exit threshold is missing!")
+        use_time_exit = False
+    max_profitable_closes = exits_cfg.get('max_profitable_closes')
+    if use_take_profit and max_profitable_closes is None:
+        logger.error("max_profitable_closes exit threshold is missing!")
+        use_take_profit = False
+    crsi_threshold = exits_cfg.get('composite_rsi_threshold')
+    if use_rsi_exit and crsi_threshold is None:
+        logger.error("composite_rsi_threshold exit threshold is missing!")
+        use_rsi_exit = False
+
+    return (use_time_exit, use_rsi_exit, use_take_profit,
+            float(crsi_threshold if crsi_threshold is not None else 0.0),
+            int(max_bars_in_trade if max_bars_in_trade is not None else 0),
+            int(max_profitable_closes if max_profitable_closes is not None else 0))
+
+
+def _collect_trades(df: pd.DataFrame, open_arr: np.ndarray,
+                    open_idx: np.ndarray, close_idx: np.ndarray,
+                    bars_held: np.ndarray) -> list:
+    """
+    Rebuild the list-of-dict trade log from the kernel's index arrays.
+    """
+    index_arr = df.index.to_numpy()
+    # struct-of-arrays gathers: every per-trade field comes out of one
+    # vectorized fancy-indexing pass instead of scalar lookups per trade
+    open_dates = index_arr[open_idx]
+    close_dates = index_arr[close_idx]
+    entry_prices = open_arr[open_idx]
+    sell_prices = open_arr[close_idx]
+    profits = (sell_prices - entry_prices) / entry_prices
+
+    all_trades = []
+    for k in range(open_idx.size):
+        trade = {
+            'open_date': open_dates[k],
+            'entry_price': entry_prices[k],
+            'bars': int(bars_held[k]),
+            'close_date': close_dates[k],
+            'sell_price': sell_prices[k],
+            'profit': profits[k],
+        }
+        logger.info(
+            "OPEN TRADE at %s at price %s", trade['open_date'], trade['entry_price'])
+        logger.info(
+            "CLOSE TRADE at %s at price %s. Profit: %.4f",
+            trade['close_date'], trade['sell_price'], trade['profit'])
+        all_trades.append(trade)
+    return all_trades
+
+
 def run(df: pd.DataFrame, strategy: Strategy) -> dict:
     """
     Execute a vectorized backtest using the provided strategy object.
 
-    The function processes the OHLCV (Open, High, Low, Close, Volume) data 
-    along with calculated indicators, applies the entry and exit logic defined 
+    The function processes the OHLCV (Open, High, Low, Close, Volume) data
+    along with calculated indicators, applies the entry and exit logic defined
     in the Strategy object, and simulates trades over the entire dataset.
 
     Input:
     df (pd.DataFrame): The OHLCV dataset.
-    strategy (Strategy): An instance of a Strategy class containing the specific 
+    strategy (Strategy): An instance of a Strategy class containing the specific
                          trading logic (entry/exit conditions) and parameters.
 
     Output:
-    list of dictionaries: A list where each dictionary represents a closed trade. 
+    list of dictionaries: A list where each dictionary represents a closed trade.
                           The keys in each trade dictionary include:
         {
         'open_date': The datetime when the trade (purchase) was initiated.
         'close_date': The datetime when the trade (sale) was closed.
         'entry_price': The price at which the asset was bought.
         'sell_price': The price at which the asset was sold.
-        'profit': The percentage return on the trade 
+        'profit': The percentage return on the trade
                       (e.g., (sell_price / entry_price - 1)).
         'bars': The number of bars each trade was active for.
         }
     """
-    logger.info(f"Starting backtest on {len(df)} rows.")
+    logger.info("Starting backtest on %d rows.", len(df))
     try:
         # getting strategy settings via strategy object
         cfg = strategy.get_cfg()
-        lookback_rsi = cfg['indicators']['rsi_period']
-        short_composite_rsi = cfg['indicators']['short_composite_rsi']
-        long_composite_rsi = cfg['indicators']['long_composite_rsi']
-        lookback_hurst = cfg['indicators']['hurst_window']
+        ind = cfg['indicators']  # single nested-dict lookup, then locals
+        lookback_rsi = ind['rsi_period']
+        short_composite_rsi = ind['short_composite_rsi']
+        long_composite_rsi = ind['long_composite_rsi']
+        lookback_hurst = ind['hurst_window']
         ######
     except Exception as e:
-        logger.error(f"Failed to load data from strategy: {e}")
+        logger.error("Failed to load data from strategy: %s", e)
         return {}  # Return empty if config fails
 
-    # dataframe columns initialization
-    df['rsi'] = 0.0
-    df['composite_rsi'] = 0.0
-    df['hurst'] = 0.0
-    df['open_position'] = False
+    # shallow copy shares the OHLCV column buffers but keeps the indicator
+    # and state columns below out of the caller's frame, so re-running on
+    # the same data never sees dirty state
+    df = df.copy(deep=False)
 
-    # while loop parameters initialization
-    all_trades = []
-    trade = {}
-    i = 0
-    signal = 'flat'
-    avg_loss = -1
-    avg_gain = -1
-    avg_loss_short = -1
-    avg_gain_short = -1
-    avg_loss_long = -1
-    avg_gain_long = -1
-
-    # computing the indicators on the whole dataset
-    '''try:
+    # computing the indicators on the whole dataset in one O(N) pass each,
+    # instead of re-running them on a growing prefix every bar (O(N^2))
+    try:
         df['rsi'] = rsi(df['Close'], lookback_rsi)
         df['composite_rsi'] = composite_rsi(
             df['Close'], short_composite_rsi, long_composite_rsi)
         df['hurst'] = hurst_exponent(df['Close'], lookback_hurst)
     except Exception as ind_err:
-        logger.warning(f"Indicator failure: {ind_err}")
+        logger.warning("Indicator failure: %s", ind_err)
         return {}
-        '''
 
+    # prices stay float64; the bounded [0, 100] indicators only need
+    # float32, which halves their memory traffic through the kernel
+    open_arr = df['Open'].to_numpy(dtype=np.float64)
+    close_arr = df['Close'].to_numpy(dtype=np.float64)
+    rsi_arr = df['rsi'].to_numpy(dtype=np.float32)
+    crsi_arr = df['composite_rsi'].to_numpy(dtype=np.float32)
+    hurst_arr = df['hurst'].to_numpy(dtype=np.float32)
+
+    # full-array entry evaluation: no Python dispatch left in the loop
+    entry_ok = strategy.vectorized_entry(rsi_arr, crsi_arr, hurst_arr)
+
+    prof_streak = _profit_streaks(open_arr, close_arr)
     try:
-        while i < len(df):
-            logger.debug(f'Column number {i}')
-            try:
-                df.loc[i, 'rsi'] , avg_gain , avg_loss = rsi(df['Close'][:i], avg_gain , avg_loss, lookback_rsi)
-                df.loc[i, 'composite_rsi'] , avg_gain_short, avg_loss_short , avg_gain_long , avg_loss_long = composite_rsi(df['Close'][:i],avg_gain_short, avg_loss_short , avg_gain_long , avg_loss_long, short_composite_rsi, long_composite_rsi)
-                df.loc[i, 'hurst'] = hurst_exponent(df['Close'][:i], lookback_hurst)
-            except Exception as e:
-                logger.warning(f"Indicator failure : {e}")
-        
-            # signal checking
-            if signal == 'buy':
-                # open the position and initialize the trade dictionary
-                df.loc[i, 'open_position'] = True
-                trade['open_date'] = df.index[i]
-                trade['entry_price'] = df.iloc[i]['Open']
-                trade['bars'] = 1
-                signal = 'flat'
-                logger.info(
-                    f"OPEN TRADE at {df.index[i]} at price {trade['entry_price']}")
-
-            elif signal == 'sell':
-                # close the position, store the trade and calculate the profit
-                df.loc[i, 'open_position'] = False
-                trade['close_date'] = df.index[i]
-                trade['sell_price'] = df.iloc[i]['Open']
-                trade['profit'] = (trade['sell_price'] -
-                                   trade['entry_price']) / trade['entry_price']
-                signal = 'flat'
-                all_trades.append(trade)
-                logger.info(
-                    f"CLOSE TRADE at {df.index[i]} at price {trade['sell_price']}. Profit: {trade['profit']:.4f}")
-                trade = {}
+        open_idx, close_idx, bars_held, cur_open = _engine_loop(
+            open_arr, prof_streak, entry_ok, crsi_arr, *_loop_params(cfg))
+    except Exception as e:
+        logger.critical("Engine failure: %s", e, exc_info=True)
+        raise e
+    df['open_position'] = _open_position_column(
+        len(df), open_idx, close_idx, cur_open)
 
-            else:
-                if i != 0:
-                    df.loc[i, 'open_position'] = df.loc[i-1, 'open_position']
-
-                if not trade.get('bars', 0) == 0:
-                    trade['bars'] += 1
-
-                try:
-                    if df.loc[i, 'open_position'] == True:
-                        signal = strategy.exit_signal(df, i, trade)
-                        signal = translator(signal, 'exit')
-
-                    elif df.loc[i, 'open_position'] == False:
-                        signal = strategy.entry_signal(df, i, trade)
-                        signal = translator(signal, 'entry')
-                except Exception as sig_err:
-                    logger.warning(
-                        f"Signal evaluation failure at index {i}: {sig_err}")
-                    signal = 'flat'  # Default to flat on error
-            if i >= len(df):
-                break
-            i = i+1
+    all_trades = _collect_trades(df, open_arr, open_idx, close_idx, bars_held)
+    logger.info("Backtest finished. Total trades: %d", len(all_trades))
+    return all_trades
+
+
+def run_batch(df: pd.DataFrame, strategies: list) -> list:
+    """
+    Execute several backtests over the same dataset, sharing one indicator
+    computation.
+
+    The indicators only depend on the 'indicators' section of the config,
+    which all ablation variants share, so they are computed once and each
+    strategy only pays for its own JIT state-machine pass.
+
+    Input:
+    df (pd.DataFrame): The OHLCV dataset, shared by every strategy.
+    strategies (list[Strategy]): Strategy instances to evaluate.
+
+    Output:
+    list of lists: For each strategy, the same trade-dictionary list that
+                   run() would have returned.
+    """
+    logger.info(
+        "Starting batched backtest: %d strategies on %d rows.",
+        len(strategies), len(df))
+    try:
+        cfg = strategies[0].get_cfg()
+        ind = cfg['indicators']  # single nested-dict lookup, then locals
+        lookback_rsi = ind['rsi_period']
+        short_composite_rsi = ind['short_composite_rsi']
+        long_composite_rsi = ind['long_composite_rsi']
+        lookback_hurst = ind['hurst_window']
+    except Exception as e:
+        logger.error("Failed to load data from strategy: %s", e)
+        return [[] for _ in strategies]
+
+    # shallow copy: same zero-copy isolation as in run()
+    df = df.copy(deep=False)
+
+    # shared indicator columns, computed once for every variant
+    try:
+        df['rsi'] = rsi(df['Close'], lookback_rsi)
+        df['composite_rsi'] = composite_rsi(
+            df['Close'], short_composite_rsi, long_composite_rsi)
+        df['hurst'] = hurst_exponent(df['Close'], lookback_hurst)
+    except Exception as ind_err:
+        logger.warning("Indicator failure: %s", ind_err)
+        return [[] for _ in strategies]
+
+    open_arr = df['Open'].to_numpy(dtype=np.float64)
+    close_arr = df['Close'].to_numpy(dtype=np.float64)
+    # same float32 narrowing as in run(): indicators are read per bar by
+    # every variant, so the smaller dtype pays off once per strategy
+    rsi_arr = df['rsi'].to_numpy(dtype=np.float32)
+    crsi_arr = df['composite_rsi'].to_numpy(dtype=np.float32)
+    hurst_arr = df['hurst'].to_numpy(dtype=np.float32)
+
+    prof_streak = _profit_streaks(open_arr, close_arr)
+
+    # ablation variants often differ only in exit flags, so their entry
+    # tapes are identical; share them keyed by the inputs that actually
+    # drive vectorized_entry
+    entry_cache = {}
+    P = len(strategies)
+    tape_idx = np.empty(P, dtype=np.int64)
+    params = []
+    try:
+        for p, strategy in enumerate(strategies):
+            ablation = getattr(strategy, 'ablation', {})
+            entry_cfg = getattr(strategy, 'entry_thresholds', {})
+            entry_key = (bool(ablation.get('use_rsi', False)),
+                         bool(ablation.get('use_hurst', False)),
+                         entry_cfg.get('rsi_low'), entry_cfg.get('rsi_high'),
+                         entry_cfg.get('hurst_threshold'))
+            cached = entry_cache.get(entry_key)
+            if cached is None:
+                cached = (len(entry_cache), strategy.vectorized_entry(
+                    rsi_arr, crsi_arr, hurst_arr))
+                entry_cache[entry_key] = cached
+            tape_idx[p] = cached[0]
+            params.append(_loop_params(strategy.get_cfg()))
+
+        entry_stack = np.stack([tape for _, tape in entry_cache.values()])
+        # one typed column per kernel parameter, indexed by variant
+        (use_time_exit, use_rsi_exit, use_take_profit,
+         crsi_threshold, max_bars_in_trade, max_profitable_closes) = (
+            np.array(col) for col in zip(*params))
+
+        # the variants are independent: one prange iteration each, all
+        # reading the same shared price/indicator arrays
+        open_idx, close_idx, bars_held, n_trades = _engine_loop_batch(
+            open_arr, prof_streak, entry_stack, tape_idx, crsi_arr,
+            use_time_exit, use_rsi_exit, use_take_profit,
+            crsi_threshold, max_bars_in_trade, max_profitable_closes)
+
+        all_trades = [
+            _collect_trades(df, open_arr, open_idx[p, :n_trades[p]],
+                            close_idx[p, :n_trades[p]],
+                            bars_held[p, :n_trades[p]])
+            for p in range(P)]
     except Exception as e:
-        logger.critical(f"Engine failure at index {i}: {e}", exc_info=True)
+        logger.critical("Engine failure: %s", e, exc_info=True)
         raise e
-    logger.info(f"Backtest finished. Total trades: {len(all_trades)}")
+    logger.info(
+        "Batched backtest finished. Trades per strategy: %s",
+        [len(t) for t in all_trades])
     return all_trades
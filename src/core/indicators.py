@@ -1,75 +1,187 @@
+import os
 import numpy as np
 import pandas as pd
-from scipy import stats
+from functools import lru_cache
+from numba import njit, prange
 import logging
 
 logger = logging.getLogger('indicators')
 
-def rsi(series: pd.Series, avg_gain : float, avg_loss : float, period: int = 2) -> float:
+
+def _wilder_rsi(gain: pd.Series, loss: pd.Series, period: int) -> pd.Series:
+    """
+    Wilder RSI from precomputed gain/loss series, so callers that need
+    several periods over the same prices (composite_rsi) only pay for the
+    diff/clip split once.
+    """
+    # Wilder smoothing: avg = avg + (x - avg)/period, seeded after `period` samples
+    avg_gain = gain.ewm(alpha=1.0 / period, min_periods=period, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1.0 / period, min_periods=period, adjust=False).mean()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        RS = avg_gain / avg_loss
+        RSI = 100 - (100 / (1 + RS))
+
+    # flat-loss edge cases: all-gain windows pin to 100, dead windows to 0
+    zero_loss = avg_loss == 0
+    RSI[zero_loss & (avg_gain > 0)] = 100.0
+    RSI[zero_loss & (avg_gain == 0)] = 0.0
+    return RSI
+
+
+def _gain_loss(series: pd.Series) -> tuple:
+    """Split the bar-to-bar deltas into positive and negative legs."""
+    delta = series.diff()
+    gain = delta.clip(lower=0) # positive returns
+    loss = -delta.clip(upper=0) # negative returns
+    return gain, loss
+
+
+@lru_cache(maxsize=32)
+def _rsi_values(series_bytes: bytes, period: int) -> np.ndarray:
+    """
+    Content-addressed Wilder RSI: the raw float64 bytes of the price
+    series key the cache, so repeated runs over the same data (parameter
+    sweeps, ablation variants) reuse the computed array instead of
+    re-walking the series.
+    """
+    series = pd.Series(np.frombuffer(series_bytes, dtype=np.float64))
+    gain, loss = _gain_loss(series)
+    return _wilder_rsi(gain, loss, period).to_numpy()
+
+
+@lru_cache(maxsize=16)
+def _composite_rsi_values(series_bytes: bytes, short: int, long: int) -> np.ndarray:
+    """
+    Content-addressed composite RSI, same idea as :func:`_rsi_values`:
+    parameter sweeps re-running on identical prices skip both Wilder
+    smoothing passes.
+    """
+    series = pd.Series(np.frombuffer(series_bytes, dtype=np.float64))
+    gain, loss = _gain_loss(series)
+    short_rsi = _wilder_rsi(gain, loss, short)
+    long_rsi = _wilder_rsi(gain, loss, long)
+    return ((0.5 * short_rsi) + (0.5 * long_rsi)).to_numpy()
+
+
+@lru_cache(maxsize=8)
+def _rolling_hurst_values(series_bytes: bytes, window: int) -> np.ndarray:
+    """
+    Content-addressed rolling Hurst: by far the most expensive indicator,
+    so sharing it across repeated runs on the same prices (ablation
+    variants, optimizer trials) matters most here.
+    """
+    values = np.frombuffer(series_bytes, dtype=np.float64)
+    return _rolling_hurst(values, window)
+
+
+@lru_cache(maxsize=16)
+def _window_sizes(N: int) -> tuple:
+    """
+    Log-spaced R/S sub-window sizes (and their log10) for a segment of
+    length N. Cached because every rolling window of the same length
+    re-derives the identical grid.
+    """
+    ws = np.unique(np.floor(
+        np.logspace(np.log10(4), np.log10(N // 2), num=10)).astype(int))
+    return ws, np.log10(ws)
+
+
+@njit(cache=True, fastmath=True)
+def _hurst_rs_kernel(ts, window_sizes):
+    """
+    JIT-compiled R/S pass for a single segment: returns the fitted
+    log-log slope (the Hurst estimate, NaN when fewer than two window
+    sizes produced a valid R/S) and the number of observations used.
+    """
+    N = ts.size
+    lx = np.empty(window_sizes.size, dtype=np.float64)
+    ly = np.empty(window_sizes.size, dtype=np.float64)
+    n_used = 0
+    for w in window_sizes:
+        if w >= N:
+            continue
+        n_segments = N // w
+        rs_sum = 0.0
+        rs_count = 0
+        for s in range(n_segments):
+            base = s * w
+            mean = 0.0
+            for t in range(w):
+                mean += ts[base + t]
+            mean /= w
+            # fused second pass: cumulative deviation, its running
+            # min/max and the variance all come out of one scan with no
+            # temporary arrays
+            y = 0.0
+            ymin = np.inf
+            ymax = -np.inf
+            s2 = 0.0
+            for t in range(w):
+                d = ts[base + t] - mean
+                y += d
+                if y < ymin:
+                    ymin = y
+                if y > ymax:
+                    ymax = y
+                s2 += d * d
+            S = np.sqrt(s2 / w)
+            if S != 0:
+                rs_sum += (ymax - ymin) / S
+                rs_count += 1
+        if rs_count > 0:
+            lx[n_used] = np.log10(w)
+            ly[n_used] = np.log10(rs_sum / rs_count)
+            n_used += 1
+
+    if n_used < 2:
+        return np.nan, n_used
+
+    # closed-form least-squares slope; linregress would also compute the
+    # unused r, p-value and stderr through scipy's Python layer
+    mx = 0.0
+    my = 0.0
+    for k in range(n_used):
+        mx += lx[k]
+        my += ly[k]
+    mx /= n_used
+    my /= n_used
+    num = 0.0
+    den = 0.0
+    for k in range(n_used):
+        dx = lx[k] - mx
+        num += dx * (ly[k] - my)
+        den += dx * dx
+    return num / den, n_used
+
+def rsi(series: pd.Series, period: int = 2) -> pd.Series:
     """
-    Compute Relative Strength Index (RSI) using the recursive Welles Wilder's smoothing method.
+    Compute the Relative Strength Index (RSI) over the whole series in one pass.
 
-    This function calculates the RSI value for the *last* price in the series, 
-    updating the running averages (avg_gain and avg_loss) for the next iteration.
+    Uses Welles Wilder's recursive smoothing, which is equivalent to an
+    exponential moving average with alpha = 1/period, so the entire series
+    is produced by vectorized pandas/numpy operations instead of a per-bar
+    recursive update.
 
     Args
-        series (pd.Series): 
-            - For the first call (initialization): must contain the first PERIOD + 1 prices.
-            - For subsequent calls (recursion): must contain the last 2 prices (Price[today] and Price[yesterday]).
-        avg_gain (float): The smoothed average gain from the previous calculation. Use -1 for initialization.
-        avg_loss (float): The smoothed average loss from the previous calculation. Use -1 for initialization.
+        series (pd.Series): Price series.
         period (int): The lookback period (N) for the RSI calculation.
 
     Returns
-        tuple[float, float, float]: (RSI value, New Avg Gain, New Avg Loss)
-    """
-    """
-    TO BE CHANGED WITH A CLASS THAT SAVES AND UPDATES INTERNALLY THE FOLLOWING QUANTITIES:
-        avg_gain
-        avg_loss
-        period
-        value
+        pd.Series: RSI values aligned with `series`; the first `period`
+        entries are NaN while the smoothing warms up.
     """
     if series is None or len(series) == 0:
         logger.error("rsi: empty series or None")
-        return float("nan") , -1 , -1
+        return pd.Series(dtype=np.float64)
     if len(series.dropna()) < period + 1:
         logger.error("rsi: insuff. data (min %d, found %d)", period + 1, len(series.dropna()))
-        return float('nan') , -1 , -1
-
-    smoothing_factor = 1/period
-
-    if avg_gain ==-1 and avg_loss == -1:
-        delta = series.diff().tail(period) # computes daily returns
-        gain = delta.clip(lower=0) # positive returns
-        loss = -delta.clip(upper=0) # negative returns
-        avg_gain = gain.mean()
-        avg_loss = loss.mean()
-    else:
-        change = series[-1] - series[-2]
-        gain = max(change,0)
-        loss = max(-change,0)
-        avg_gain = avg_gain + smoothing_factor*(gain - avg_gain)
-        avg_loss = avg_loss + smoothing_factor*(loss - avg_loss)
-
-
-    if avg_loss == 0.0:
-        if avg_gain > 0.0:
-            RSI =100.0 
-        else:
-            RSI = 0.0
-    elif avg_gain == 0.0 and avg_loss > 0.0:
-        RSI = 0.0
-
-    else:
-        RS = avg_gain / avg_loss
-        RSI = 100 - (100 / (1 + RS))
-    
+        return pd.Series(np.nan, index=series.index)
+
+    values = _rsi_values(series.to_numpy(dtype=np.float64).tobytes(), period)
 
-    logger.debug(f'RSI value is {RSI}')
-    if not np.isfinite(RSI):
-        logger.error("rsi: inf value (%.5f)", RSI)
-    return RSI , avg_gain , avg_loss
+    logger.debug("rsi: computed %d values", len(values))
+    return pd.Series(values, index=series.index)
 
 
 def hurst_local(series: pd.Series) -> float:
@@ -107,37 +219,63 @@ def hurst_local(series: pd.Series) -> float:
     if max_window < 4:
         logger.error("hurst_local: max_window too short (max_window=%d)", max_window)
         return np.nan
-    window_sizes = np.unique(np.floor(np.logspace(np.log10(4), np.log10(max_window), num=10)).astype(int))
-    
-    RS_vals = []
-    used_windows = []
-    for w in window_sizes:
-        if w >= N:
-            continue
-        n_segments = N // w
-        RS_seg = []
-        for i in range(n_segments):
-            seg = ts[i*w:(i+1)*w] # current segment
-            seg = seg - np.mean(seg) # detrend
-            Y = np.cumsum(seg) # cumulative deviation from mean
-            R = np.max(Y) - np.min(Y) # max range of cumulative dev
-            S = np.std(seg) # standard deviation of segment
-            if S != 0:
-                RS_seg.append(R/S)
-        if RS_seg:
-            RS_vals.append(np.mean(RS_seg))
-            used_windows.append(w)
-    if len(RS_vals) < 2:
-        logger.error("hurst_local: R/S insuff. observations (len=%d)", len(RS_vals))
+    window_sizes, _ = _window_sizes(N)
+
+    # the R/S scan and the log-log slope fit both run inside the kernel
+    slope, n_used = _hurst_rs_kernel(ts, window_sizes)
+    if n_used < 2:
+        logger.error("hurst_local: R/S insuff. observations (len=%d)", n_used)
         return np.nan
-    # The Hurst exponent is the slope of the log-log plot
-    lx = np.log10(np.array(used_windows))
-    ly = np.log10(RS_vals)
-    slope, _, _, _, _ = stats.linregress(lx, ly) 
     return slope
 
 
-def hurst_exponent(series: pd.Series, window: int = 20) -> float:
+def _rolling_hurst(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling R/S Hurst estimation over every window, in parallel.
+
+    Equivalent to ``rolling(window).apply(hurst_local, raw=True)`` but
+    without the per-window Python callback: the windows are independent,
+    so a parallel JIT kernel distributes them across cores, each running
+    the fused R/S scan and slope fit of :func:`_hurst_rs_kernel`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1-dimensional float array of prices (or returns).
+    window : int
+        Rolling window length; windows shorter than 8 yield all-NaN.
+
+    Returns
+    -------
+    np.ndarray
+        Array of len(values) Hurst estimates, NaN until the first full
+        window and wherever too few valid R/S observations exist.
+    """
+    N = len(values)
+    if N < window or window < 8 or window // 2 < 4:
+        return np.full(N, np.nan)
+    window_sizes, _ = _window_sizes(window)
+    return _rolling_hurst_kernel(np.ascontiguousarray(values, dtype=np.float64),
+                                 window, window_sizes)
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _rolling_hurst_kernel(values, window, window_sizes):
+    """
+    Parallel driver: one prange iteration per rolling window, each
+    delegating to the single-segment R/S kernel.
+    """
+    N = values.size
+    out = np.full(N, np.nan)
+    for i in prange(window - 1, N):
+        slope, n_used = _hurst_rs_kernel(values[i - window + 1:i + 1],
+                                         window_sizes)
+        if n_used >= 2:
+            out[i] = slope
+    return out
+
+
+def hurst_exponent(series: pd.Series, window: int = 20) -> pd.Series:
     """
     Compute a rolling (moving-window) Hurst exponent series.
 
@@ -154,52 +292,60 @@ def hurst_exponent(series: pd.Series, window: int = 20) -> float:
 
     Returns
     -------
-    float
-        Last rolling Hurst value (np.nan if window is not full).
-    
+    pd.Series
+        Rolling Hurst values aligned with `series` (NaN until the window is full).
+
     Notes
     -----
-    - The function delegates the actual R/S calculation to :func:`hurst_local`.
+    - The function delegates the actual R/S calculation to :func:`_rolling_hurst`.
     - Caller may choose to post-process the output (e.g., smoothing or forward-filling) depending
       on downstream use-cases.
+    - Setting the ``HURST_STUB`` environment variable short-circuits to a
+      constant 0.5 (the random-walk value), useful to ablate the indicator
+      without touching the config.
     """
-    '''if series is None or len(series) == 0:
+    if os.environ.get('HURST_STUB'):
+        logger.warning("hurst_exponent: HURST_STUB set, returning constant 0.5")
+        return pd.Series(0.5, index=series.index)
+
+    if series is None or len(series) == 0:
         logger.error("hurst_exponent: empty series or None")
-        return float("nan")
+        return pd.Series(dtype=np.float64)
     if len(series.dropna()) < window:
         logger.error("hurst_exponent: insuff. data (window=%d, found=%d)", window, len(series.dropna()))
-        return
-
-    H_series = series.rolling(window).apply(lambda x: hurst_local(x), raw=False)
-    H = float(H_series.iloc[-1])'''
-    #### TEMPORANEO
-    H = np.random.rand()
+        return pd.Series(np.nan, index=series.index)
 
-    logger.debug(f"H is {H}")
-    #### TEMPORANEO
+    # every rolling window is estimated in one batched pass instead of a
+    # Python hurst_local callback per window; the raw bytes key a cache
+    # shared across repeated runs on the same prices
+    H = pd.Series(_rolling_hurst_values(
+        series.to_numpy(dtype=np.float64).tobytes(), window),
+        index=series.index)
+    logger.debug("hurst_exponent: computed %d values", len(H))
     return H
 
-def composite_rsi(series: pd.Series,avg_gain_short:float , avg_loss_short:float, avg_gain_long:float ,avg_loss_long:float, short: int, long: int) -> float:
+def composite_rsi(series: pd.Series, short: int, long: int) -> pd.Series:
     """
-    TO BE CHANGED WITH A CLASS THAT SAVES AND UPDATES THE FOLLOWING QUANTITIES INTERNALLY:
+    Compute the composite RSI as the equal-weighted blend of a short and a
+    long Wilder RSI over the whole series.
 
-        avg_loss_short
-        avg_gain_short
-        avg_loss_long
-        avg_gain_long
-        short_period
-        long_period
-        value
+    Args
+        series (pd.Series): Price series.
+        short (int): Lookback of the fast RSI component.
+        long (int): Lookback of the slow RSI component.
 
+    Returns
+        pd.Series: Composite RSI aligned with `series`.
     """
     # weights initialized to 0.5
     if series is None or len(series) == 0:
         logger.error("composite_rsi: empty series or None")
-        return float("nan") , -1 , -1 , -1 , -1
+        return pd.Series(dtype=np.float64)
     if len(series.dropna()) < long + 1:
         logger.error("composite_rsi: insuff. data for long=%d (found=%d)", long, len(series.dropna()))
-    short_rsi, avg_gain_short, avg_loss_short = rsi(series, avg_gain_short, avg_loss_short, period=short)
-    long_rsi, avg_gain_long, avg_loss_long = rsi(series, avg_gain_long, avg_loss_long, period=short)
-    comp_rsi = (0.5 * short_rsi) + (0.5 * long_rsi)
-    logger.debug(f"composite_rsi is {comp_rsi}")
-    return comp_rsi , avg_gain_short , avg_loss_short , avg_gain_long , avg_loss_long
\ No newline at end of file
+    # both legs smooth one shared gain/loss split inside the cached
+    # helper; repeated runs on the same prices reuse the blended array
+    values = _composite_rsi_values(
+        series.to_numpy(dtype=np.float64).tobytes(), short, long)
+    logger.debug("composite_rsi: computed %d values", len(values))
+    return pd.Series(values, index=series.index)
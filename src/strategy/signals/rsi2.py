@@ -13,11 +13,12 @@ def long_entry(df: pd.DataFrame, i: int, params: dict) -> bool:
 
     rsi_low = params['rsi_low']
     rsi_high = params['rsi_high']
- 
-    if(rsi_low is None or pd.isna(rsi_low) or 
-       rsi_high is None or pd.isna(rsi_high) or 
-       curr_rsi is None or pd.isna(curr_rsi)
-    ):
+
+    if rsi_low is None or rsi_high is None or curr_rsi is None:
+        return False
+    # NaN via self-inequality: one float compare per operand instead of
+    # three pd.isna dispatches
+    if rsi_low != rsi_low or rsi_high != rsi_high or curr_rsi != curr_rsi:
         return False
 
     return rsi_low <= curr_rsi <= rsi_high
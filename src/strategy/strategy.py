@@ -1,7 +1,8 @@
+import copy
+import numpy as np
 import pandas as pd
 from .signals.rsi2 import long_entry
 from .signals.hurst_filter import allow
-from .exits.time_exit import should_exit
 from .exits.profitable_close_exit import should_exit as prof_exit
 from .signals.composite_rsi_exit import should_exit as rsi_exit
 import logging
@@ -62,6 +63,38 @@ class Strategy:
             if (self.ablation['use_hurst']) and ('hurst_threshold' not in self.entry_thresholds or not self.entry_thresholds['hurst_threshold']):
                 logger_entry.error("hurst_threshold entry logic is absent")
         self.__cfg = cfg
+        # thresholds resolved to plain scalars once, so the per-bar signal
+        # paths hash into these small dicts instead of the full config ones
+        self._entry_scalars = {
+            k: float(v)
+            for k, v in getattr(self, 'entry_thresholds', {}).items()
+            if isinstance(v, (int, float))}
+        self._exit_scalars = {
+            k: v for k, v in getattr(self, 'exit_thresholds', {}).items()
+            if isinstance(v, (int, float))}
+        self._derive_gates()
+
+    def _derive_gates(self):
+        """
+        Collapse the ablation flags and threshold presence into plain
+        booleans, so the per-bar signal paths test one attribute instead
+        of re-walking the ablation and threshold dicts on every call.
+        Missing thresholds are already logged once by the __init__
+        validation above.
+        """
+        ablation = getattr(self, 'ablation', {})
+        self._use_rsi_entry = bool(ablation.get('use_rsi'))
+        self._rsi_entry_ready = ('rsi_low' in self._entry_scalars
+                                 and 'rsi_high' in self._entry_scalars)
+        self._use_hurst_entry = bool(ablation.get('use_hurst'))
+        self._hurst_entry_ready = 'hurst_threshold' in self._entry_scalars
+        self._use_time_exit = (bool(ablation.get('use_time_exit'))
+                               and 'max_bars_in_trade' in self._exit_scalars)
+        self._max_bars = self._exit_scalars.get('max_bars_in_trade', 0)
+        self._use_take_profit = (bool(ablation.get('use_take_profit'))
+                                 and 'max_profitable_closes' in self._exit_scalars)
+        self._use_crsi_exit = (bool(ablation.get('use_composite_rsi'))
+                               and 'composite_rsi_threshold' in self._exit_scalars)
 
     def get_cfg(self) -> dict:
         """
@@ -71,13 +104,92 @@ class Strategy:
         """
         return self.__cfg
 
+    def clone_with_ablation(self, flag: str, value: bool) -> "Strategy":
+        """
+        Return a copy of this strategy with a single ablation flag toggled.
+
+        Skips re-running the __init__ validation: only the configuration
+        dicts touched by the override are copied, everything else is shared
+        with the original instance.
+        Input:
+        flag (str): Name of the ablation flag to override.
+        value (bool): New value for the flag.
+        Output:
+        Strategy: The cloned strategy with the override applied.
+        """
+        clone = copy.copy(self)
+        cfg = dict(self.__cfg)
+        cfg['ablation'] = dict(cfg.get('ablation', {}))
+        cfg['ablation'][flag] = value
+        clone.__cfg = cfg
+        clone.ablation = cfg['ablation']
+        clone._derive_gates()
+        return clone
+
     def set_cfg(self, new_cfg: dict):
         """
         Setter method for configuration parameters.
+        Refreshes the cached threshold scalars and gate booleans so the
+        per-bar paths never read values from a replaced config.
         Input:
         new_cfg (dict): new configurations
         """
         self.__cfg = new_cfg
+        self.ablation = new_cfg.get('ablation', {})
+        self.entry_thresholds = new_cfg.get('entry_thresholds', {})
+        self.exit_thresholds = new_cfg.get('exit_thresholds', {})
+        self._entry_scalars = {
+            k: float(v) for k, v in self.entry_thresholds.items()
+            if isinstance(v, (int, float))}
+        self._exit_scalars = {
+            k: v for k, v in self.exit_thresholds.items()
+            if isinstance(v, (int, float))}
+        self._derive_gates()
+
+    def vectorized_entry(self, rsi_arr: np.ndarray, crsi_arr: np.ndarray,
+                         hurst_arr: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the entry conditions for every bar at once.
+        Applies the same RSI-range and Hurst-filter logic as entry_signal,
+        but as boolean mask operations over the full indicator arrays, so
+        the engine loop only has to read one precomputed bool per bar.
+        Input:
+        rsi_arr (np.ndarray): RSI values per bar.
+        crsi_arr (np.ndarray): Composite RSI values per bar (unused by the
+                               current entry logic, kept for symmetry).
+        hurst_arr (np.ndarray): Hurst exponent values per bar.
+        Output:
+        np.ndarray: Boolean mask, True where the long entry condition holds.
+        """
+        mask = np.ones(len(rsi_arr), dtype=np.bool_)
+        entry_cfg = getattr(self, 'entry_thresholds', {})
+        ablation = getattr(self, 'ablation', {})
+
+        if ablation.get('use_rsi', False):
+            rsi_low = entry_cfg.get('rsi_low')
+            rsi_high = entry_cfg.get('rsi_high')
+            if rsi_low is None or rsi_high is None:
+                logger_entry.error(
+                    'Parameters dictionary does NOT contain rsi_low/rsi_high!')
+                mask[:] = False
+            else:
+                # NaN compares False, so warm-up bars are excluded for free
+                mask &= (rsi_arr >= rsi_low) & (rsi_arr <= rsi_high)
+        else:
+            logger_entry.debug('RSI entry signal is disabled')
+
+        if ablation.get('use_hurst', False):
+            hurst_threshold = entry_cfg.get('hurst_threshold')
+            if hurst_threshold is None:
+                logger_entry.error(
+                    "Parameters dictionary does NOT contain hurst threshold!")
+                mask[:] = False
+            else:
+                mask &= hurst_arr > hurst_threshold
+        else:
+            logger_entry.debug('Hurst entry signal is disabled')
+
+        return mask
 
     def entry_signal(self, df: pd.DataFrame, i: int, state: dict) -> bool:
         """
@@ -90,66 +202,50 @@ class Strategy:
         Output:
         bool: True if long entry condition is met.
         """
-        try:
-            if i >= len(df):
-                return False
+        if i >= len(df):
+            return False
 
-            long_entry_check = True
-            # Get entry thresholds config
-            entry_cfg = self.entry_thresholds
+        long_entry_check = True
+        # Get entry thresholds (pre-resolved to plain floats)
+        entry_cfg = self._entry_scalars
 
-            # RSI check
-            if (self.ablation['use_rsi']) and ('rsi' in df.columns and 'rsi_low' in entry_cfg and 'rsi_high' in entry_cfg):
-                if pd.isna(df.iloc[i]['rsi']):
+        # RSI check (gates resolved once by _derive_gates)
+        if self._use_rsi_entry:
+            if not self._rsi_entry_ready:
+                long_entry_check = False
+            elif 'rsi' not in df.columns:
+                logger_entry.error('RSI is NOT in the Dataframe!')
+                long_entry_check = False
+            else:
+                curr_rsi = df.iloc[i]['rsi']
+                if curr_rsi != curr_rsi:  # NaN self-inequality check
                     logger_entry.warning(
-                        f"Signal Invalidated at index {i}: RSI is NaN")
+                        "Signal Invalidated at index %d: RSI is NaN", i)
                     return False
-
                 if not long_entry(df, i, entry_cfg):
                     long_entry_check = False
                     logger_entry.info(
                         "NO ENTRY: RSI indicators was NOT between 10 ad 20.")
-            elif not (self.ablation['use_rsi']):
-                logger_entry.debug('RSI entry signal is disabled')
-            elif 'rsi' not in df.columns:
-                logger_entry.error('RSI is NOT in the Dataframe!')
-                long_entry_check = False
-            elif 'rsi_low' not in entry_cfg:
-                logger_entry.error(
-                    'Parameters dictionary does NOT contain rsi_low! ')
+
+        # Hurst check
+        if self._use_hurst_entry:
+            if not self._hurst_entry_ready:
                 long_entry_check = False
-            elif 'rsi_high' not in entry_cfg:
-                logger_entry.error(
-                    'Parameters dictionary does NOT contain rsi_high! ')
+            elif 'hurst' not in df.columns:
+                logger_entry.error('Hurst exponent is NOT in the dataframe!')
                 long_entry_check = False
-
-            # Hurst check
-            if (self.ablation['use_hurst']) and ('hurst' in df.columns and 'hurst_threshold' in entry_cfg):
-                if pd.isna(df.iloc[i]['hurst']):
+            else:
+                curr_hurst = df.iloc[i]['hurst']
+                if curr_hurst != curr_hurst:  # NaN self-inequality check
                     logger_entry.warning(
-                        f"Signal Invalidated at index {i}: Hurst is NaN")
+                        "Signal Invalidated at index %d: Hurst is NaN", i)
                     return False
-
                 if long_entry_check and not allow(df, i, entry_cfg):
                     long_entry_check = False
                     logger_entry.info(
                         "NO ENTRY: Hurst filter is NOT above the threshold.")
-            elif not self.ablation['use_hurst']:
-                logger_entry.debug('Hurst entry signal is disabled')
-            elif 'hurst_threshold' not in entry_cfg:
-                logger_entry.error(
-                    "Parameters dictionary does NOT contain hurst threshold!")
-                long_entry_check = False
-            elif 'hurst' not in df.columns:
-                logger_entry.error('Hurst exponent is NOT in the dataframe!')
-                long_entry_check = False
 
-            return long_entry_check
-
-        except Exception as e:
-            logger_entry.error(
-                f"Strategy Entry Crash at index {i}: {e}", exc_info=True)
-            return False
+        return long_entry_check
 
     def exit_signal(self, df: pd.DataFrame, i: int, state: dict) -> bool:
         """
@@ -162,64 +258,47 @@ class Strategy:
         Output:
         bool: True if exit condition is met.
         """
-        try:
-            if i >= len(df):
-                return False
+        if i >= len(df):
+            return False
 
-            exit_position = False
-            # Get exit_thresholds config
-            exits_cfg = self.exit_thresholds
+        exit_position = False
+        # Get exit thresholds (pre-resolved to plain scalars)
+        exits_cfg = self._exit_scalars
 
-            # Time exit check
-            if 'bars' not in state.keys():
+        # Time exit check (gate folds the flag and threshold presence)
+        if self._use_time_exit:
+            if 'bars' not in state:
                 logger_exit.error("'bars' number is NOT in state dictionary!")
-            elif not(self.ablation['use_time_exit']):
-                logger_exit.debug('max time exit signal is disabled')
-            elif 'max_bars_in_trade' not in exits_cfg:
-                logger_exit.error(
-                    "The parameters 'max_bars_in_trade' is NOT in the configuration dictionary!")
-            elif should_exit(state, exits_cfg):
+            elif state['bars'] >= self._max_bars:
                 exit_position = True
                 logger_exit.info(
-                    f"EXIT SIGNAL: the maximum bars in trade is reached")
-
-            # profit exit check
-            if not exit_position:
-                if 'entry_price' not in state.keys():
-                    logger_exit.error("'entry_price' is NOT in state dictionary!")
-                elif not self.ablation['use_take_profit']:
-                    logger_exit.debug('take profit exit signal is disabled')
-                elif 'bars' not in state.keys():
-                    logger_exit.error("'bars' is NOT in state dictionary!")
-                elif 'max_profitable_closes' not in exits_cfg:
-                    logger_exit.error(
-                        "The parameters 'max_profitable_closes' is NOT in the configuration dictionary!")
-                elif prof_exit(df, i, state, exits_cfg):
+                    "EXIT SIGNAL: the maximum bars in trade is reached")
+
+        # profit exit check
+        if not exit_position and self._use_take_profit:
+            if 'entry_price' not in state:
+                logger_exit.error("'entry_price' is NOT in state dictionary!")
+            elif 'bars' not in state:
+                logger_exit.error("'bars' is NOT in state dictionary!")
+            elif prof_exit(df, i, state, exits_cfg):
+                exit_position = True
+                logger_exit.info(
+                    "EXIT SIGNAL: the position was profitable for %s days.",
+                    exits_cfg['max_profitable_closes'])
+
+        # composite rsi check
+        if not exit_position and self._use_crsi_exit:
+            if 'composite_rsi' not in df.columns:
+                logger_exit.error("'composite_rsi' is NOT in the dataframe!")
+            else:
+                curr_crsi = df.iloc[i]['composite_rsi']
+                if curr_crsi != curr_crsi:  # NaN self-inequality check
+                    logger_exit.warning(
+                        "Exit Signal Ignored at index %d: Composite RSI is NaN", i)
+                    return False
+                if rsi_exit(df, i, exits_cfg):
                     exit_position = True
                     logger_exit.info(
-                        f"EXIT SIGNAL: the position was profitable for {exits_cfg['max_profitable_closes']} days.")
-
-            # composite rsi check
-            if not exit_position:
-                if 'composite_rsi' not in df.columns:
-                    logger_exit.error("'composite_rsi' is NOT in the dataframe!")
-                elif not(self.ablation['use_composite_rsi']):
-                    logger_exit.debug('composite rsi exit signal is disabled')
-                elif 'composite_rsi_threshold' not in exits_cfg:
-                    logger_exit.error(
-                        "The parameters composite_rsi_threshold is NOT in the configuration dictionary!")
-                else:
-                    if pd.isna(df.iloc[i]['composite_rsi']):
-                        logger_exit.warning(
-                            f"Exit Signal Ignored at index {i}: Composite RSI is NaN")
-                        return False
-                    if rsi_exit(df, i, exits_cfg):
-                        exit_position = True
-                        logger_exit.info(
-                            f"EXIT SIGNAL: the composite rsi signal was triggered!")
-
-            return exit_position
-
-        except Exception as e:
-            logger_exit.error(f"Exit Signal Crash at index {i}: {e}")
-            return False
+                        "EXIT SIGNAL: the composite rsi signal was triggered!")
+
+        return exit_position